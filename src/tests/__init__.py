@@ -0,0 +1,23 @@
+# See LICENSE file for copyright and license details.
+# TUM CS Bot - https://github.com/ro-i/tumcsbot
+
+import queue
+from threading import get_ident
+
+from tumcsbot.lib import _DBPool
+
+
+def close_pooled_connections() -> None:
+    """Close the pooled database connections and clear the pool.
+
+    Connections of other threads are closed when they are garbage
+    collected.
+    """
+    for key, pool in _DBPool._pools.items():
+        while key[1] in (None, get_ident()):
+            try:
+                connection, _ = pool.get_nowait()
+            except queue.Empty:
+                break
+            _DBPool.close(connection, key[3])
+    _DBPool._pools.clear()
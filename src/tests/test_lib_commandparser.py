@@ -181,6 +181,23 @@ class CommandParserTestQuotes(CommandParserTest):
         self.assertIsNone(self._do_parse_args("test 'a 'b' c"))
         # self.assertIsNone(self._do_parse_args("test 'a \\' b' c"))
 
+    def test_unterminated_quotation(self) -> None:
+        self.parser.add_subcommand("test", greedy={"arg1": str})
+        self.assertIsNone(self._do_parse_args('test "a'))
+        self.assertIsNone(self._do_parse_args("test a 'b"))
+        self.assertIsNone(self._do_parse_args('test "a b" "'))
+        # An escaped quote does not terminate the quotation.
+        self.assertIsNone(self._do_parse_args('test "11*\\"éa'))
+        self.assertIsNone(self._do_parse_args("test 'a\\'"))
+        self.assertEqual(self._do_parse_args('test "a\\"" b'), {"arg1": ['a"', "b"]})
+        # Quotes inside of an unquoted argument are kept.
+        self.assertEqual(self._do_parse_args('test a"b'), {"arg1": ['a"b']})
+
+    def test_unterminated_quotation_backslashes(self) -> None:
+        # Used to take exponential time.
+        self.parser.add_subcommand("test", args={"arg1": str, "arg2": str})
+        self.assertIsNone(self._do_parse_args("test '" + 64 * "\\" + " c"))
+
 
 class CommandParserTestOpts(CommandParserTest):
     def test_valid_single_opt(self) -> None:
@@ -5,11 +5,18 @@
 
 import tempfile
 import unittest
+from os.path import join
 
-from tumcsbot.lib import Conf, DB
+from tumcsbot.lib import Conf, DB, is_bot_owner
+
+from . import close_pooled_connections
 
 
 class ConfTest(unittest.TestCase):
+    def tearDown(self) -> None:
+        # Do not keep connections to deleted temporary databases.
+        close_pooled_connections()
+
     def test_conf(self) -> None:
         with tempfile.NamedTemporaryFile() as file:
             db = DB(db_path=file.name)
@@ -34,3 +41,47 @@ class ConfTest(unittest.TestCase):
                 conf.remove("name")
             except Exception as exc:
                 self.fail(f"received exception {exc}")
+            db.close()
+
+    def test_is_bot_owner(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path: str = join(tmp_dir, "test.db")
+            db: DB = DB(db_path=db_path)
+            Conf(db=db).set("bot_owner", "42")
+            self.assertTrue(is_bot_owner(42, db=db))
+            self.assertFalse(is_bot_owner(43, db=db))
+            connection = db.connection
+            db.close()
+
+            DB.path = db_path
+            try:
+                self.assertTrue(is_bot_owner(42))
+                # The connection went back to the pool and is reused.
+                self.assertFalse(is_bot_owner(43))
+                db = DB()
+                self.assertIs(db.connection, connection)
+                db.close()
+            finally:
+                DB.path = None
+
+    def test_pooled_checkout(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            DB.path = join(tmp_dir, "test.db")
+            try:
+                Conf().close()
+
+                # Trace the statements on the pooled connection.
+                db: DB = DB()
+                connection = db.connection
+                statements: list[str] = []
+                connection.set_trace_callback(statements.append)
+                db.close()
+
+                conf: Conf = Conf()
+                self.assertIsNone(conf.get("name"))
+                conf.close()
+                connection.set_trace_callback(None)
+                self.assertFalse(any("create table" in s for s in statements))
+                self.assertTrue(statements)
+            finally:
+                DB.path = None
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+# See LICENSE file for copyright and license details.
+# TUM CS Bot - https://github.com/ro-i/tumcsbot
+
+import os
+import tempfile
+import unittest
+from os.path import join
+from threading import Thread
+
+from tumcsbot.lib import DB, _DBPool
+
+from . import close_pooled_connections
+
+
+class DBTest(unittest.TestCase):
+    def tearDown(self) -> None:
+        # Do not keep connections to deleted temporary databases.
+        close_pooled_connections()
+
+    def test_connection_pool(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path: str = join(tmp_dir, "test.db")
+            db: DB = DB(db_path=db_path)
+            connection = db.connection
+            db.execute("create table Test (Value text)")
+            db.execute("insert into Test values ('uncommitted')")
+            db.close()
+
+            db = DB(db_path=db_path)
+            self.assertIs(db.connection, connection)
+            # Uncommitted changes do not survive the pool.
+            self.assertEqual(db.execute("select * from Test"), [])
+            db.close()
+
+            # Connections are not shared between threads.
+            connections: list[object] = []
+
+            def run() -> None:
+                thread_db: DB = DB(db_path=db_path)
+                connections.append(thread_db.connection)
+                thread_db.close()
+
+            thread: Thread = Thread(target=run)
+            thread.start()
+            thread.join()
+            self.assertIsNot(connections[0], connection)
+
+    def test_checkout_table(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path: str = join(tmp_dir, "test.db")
+            db: DB = DB(db_path=db_path)
+            db.checkout_table("Test", "(Value text)")
+            db.close()
+
+            # Dropping a table invalidates the checked out tables.
+            db = DB(db_path=db_path)
+            db.execute("drop table Test", commit=True)
+            db.checkout_table("Test", "(Value text)")
+            self.assertEqual(db.execute("select * from Test"), [])
+
+            # So does a failing statement, e.g., because another
+            # connection dropped the table.
+            other: DB = DB(db_path=db_path)
+            other.execute("drop table Test", commit=True)
+            other.close()
+            with self.assertRaises(Exception):
+                db.execute("select * from Test")
+            db.checkout_table("Test", "(Value text)")
+            self.assertEqual(db.execute("select * from Test"), [])
+
+            with self.assertRaises(ValueError):
+                db.checkout_table("Test; drop table Test", "(Value text)")
+            db.close()
+
+    def test_read_only(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path: str = join(tmp_dir, "test.db")
+            db: DB = DB(db_path=db_path)
+            db.checkout_table("Test", "(Value text)")
+            db.execute("insert into Test values ('a')", commit=True)
+
+            db_ro: DB = DB(db_path=db_path, read_only=True)
+            self.assertEqual(db_ro.execute("select * from Test"), [("a",)])
+            with self.assertRaises(Exception):
+                db_ro.execute("insert into Test values ('b')")
+            db_ro.close()
+            db.close()
+
+    def test_execute_many(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db: DB = DB(db_path=join(tmp_dir, "test.db"))
+            db.checkout_table("Test", "(Key text primary key, Value integer)")
+            db.execute_many(
+                "insert into Test values (?, ?)",
+                ((str(i), i) for i in range(3)),
+                commit=True,
+            )
+            self.assertEqual(
+                db.execute("select * from Test"), [("0", 0), ("1", 1), ("2", 2)]
+            )
+            # A failing execution rolls back the whole batch.
+            with self.assertRaises(Exception):
+                db.execute_many(
+                    "insert into Test values (?, ?)", [("3", 3), ("0", 0)], commit=True
+                )
+            self.assertEqual(len(db.execute("select * from Test")), 3)
+            db.close()
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork()")
+    def test_fork(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path: str = join(tmp_dir, "test.db")
+            db: DB = DB(db_path=db_path)
+            db.close()
+
+            # The child starts with an empty pool and a fresh lock.
+            with _DBPool._lock:
+                pid: int = os.fork()
+                if pid == 0:
+                    ok: bool = not _DBPool._pools and not _DBPool._lock.locked()
+                    os._exit(0 if ok else 1)
+            _, status = os.waitpid(pid, 0)
+            self.assertEqual(os.waitstatus_to_exitcode(status), 0)
@@ -41,9 +41,12 @@ class RegexTest(unittest.TestCase):
         ("@**J\\n**", None),
         ('@_**John D"e**', None),
     ]
-    user_names_ids: list[tuple[str, tuple[str, int] | None]] = [
+    user_names_ids: list[tuple[str, tuple[str, int | None] | None]] = [
         ("@_**John Doe|123**", ("John Doe", 123)),
         ("@**John Doe|456**", ("John Doe", 456)),
+        ("@**John Doe**", ("John Doe", None)),
+        ("John Doe", ("John Doe", None)),
+        ("@**John|Doe|789**", ("John|Doe", 789)),
         ("@John Doe|123**", None),
         ("@**John Doe|123", None),
     ]
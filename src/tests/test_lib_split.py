@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+
+# See LICENSE file for copyright and license details.
+# TUM CS Bot - https://github.com/ro-i/tumcsbot
+
+import unittest
+
+from tumcsbot.lib import split
+
+
+class SplitTest(unittest.TestCase):
+    def test_split(self) -> None:
+        self.assertEqual(split("a b  c"), ["a", "b", "c"])
+        self.assertEqual(split("a 'b c' \"d e\""), ["a", "b c", "d e"])
+        self.assertEqual(split("a,b,,c", sep=","), ["a", "b", "c"])
+        self.assertEqual(split("a,'',c", sep=","), ["a", "c"])
+        self.assertEqual(split("a,'',c", sep=",", discard_empty=False), ["a", "", "c"])
+        self.assertEqual(split(" a , 'b,c' ", sep=","), ["a", "b,c"])
+        self.assertEqual(split(""), [])
+        self.assertIsNone(split("a 'b"))
+        # A failed split must not influence subsequent ones.
+        self.assertEqual(split("a b"), ["a", "b"])
+
+    def test_exact_split(self) -> None:
+        self.assertEqual(split("a b", exact_split=2), ["a", "b"])
+        self.assertIsNone(split("a b c", exact_split=2))
+
+    def test_converter(self) -> None:
+        self.assertEqual(split("a 1 2 3", converter=(str, int)), ["a", 1, 2, 3])
+        self.assertEqual(split("a b", converter=(int,)), [None, None])
+        self.assertEqual(
+            split("1 2 3", converter=(str,), default_converter=int), ["1", 2, 3]
+        )
+        self.assertEqual(
+            split(
+                "a,b c,d", default_converter=lambda t: split(t, sep=",", exact_split=2)
+            ),
+            [["a", "b"], ["c", "d"]],
+        )
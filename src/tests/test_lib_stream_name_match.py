@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+
+# See LICENSE file for copyright and license details.
+# TUM CS Bot - https://github.com/ro-i/tumcsbot
+
+import unittest
+
+from tumcsbot.lib import stream_name_match
+
+
+class StreamNameMatchTest(unittest.TestCase):
+    matches: list[tuple[str, str, bool]] = [
+        ("test", "test", True),
+        ("test", "TEST", True),
+        ("te.*", "Test Stream", True),
+        (r"\w+", "Übung", True),
+        (r"\w+", "abc def", False),
+        ("test", "test2", False),
+        ("Straße", "STRASSE", False),
+        # Unicode case folding relates the Kelvin sign to "k".
+        ("k", "\u212a", True),
+        ("\u212a", "k", True),
+        ("\u212a", "K", True),
+        (r"\s", "\x1c", True),
+        ("(", "(", False),
+    ]
+
+    def test_stream_name_match(self) -> None:
+        for stream_reg, stream_name, match in self.matches:
+            self.assertEqual(stream_name_match(stream_reg, stream_name), match)
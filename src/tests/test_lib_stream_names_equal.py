@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+
+# See LICENSE file for copyright and license details.
+# TUM CS Bot - https://github.com/ro-i/tumcsbot
+
+import unittest
+
+from tumcsbot.lib import CanonStream, stream_names_equal
+
+
+class StreamNamesEqualTest(unittest.TestCase):
+    stream_names: list[tuple[str, str, bool]] = [
+        ("test", "test", True),
+        ("Test", "tEST", True),
+        ("abc def", "ABC DEF", True),
+        ("Straße", "STRASSE", True),
+        ("test", "test2", False),
+        ("test ", "test", False),
+        ("", "", True),
+    ]
+
+    def test_stream_names_equal(self) -> None:
+        for name1, name2, equal in self.stream_names:
+            self.assertEqual(stream_names_equal(name1, name2), equal)
+            self.assertEqual(stream_names_equal(name2, name1), equal)
+
+    def test_canon_stream_names_equal(self) -> None:
+        for name1, name2, equal in self.stream_names:
+            canon1: CanonStream = CanonStream(name1)
+            self.assertEqual(stream_names_equal(canon1, CanonStream(name2)), equal)
+            self.assertEqual(stream_names_equal(canon1, name2), equal)
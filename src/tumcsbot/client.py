@@ -15,7 +15,15 @@ from typing import cast, Any, Callable, IO, Iterable, Sequence
 
 from zulip import Client as ZulipClient
 
-from tumcsbot.lib import stream_names_equal, DB, Response, MessageType, Regex
+from tumcsbot.lib import (
+    compile_stream_regex,
+    stream_names_equal,
+    CanonStream,
+    DB,
+    Response,
+    MessageType,
+    Regex,
+)
 
 
 def synchronized(lock: RLock) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
@@ -184,9 +192,8 @@ class Client(ZulipClient):
         if not regex:
             return []
 
-        try:
-            pat: re.Pattern[str] = re.compile(regex, flags=re.I)
-        except re.error:
+        pat: re.Pattern[str] | None = compile_stream_regex(regex)
+        if pat is None:
             return []
 
         return [
@@ -303,8 +310,9 @@ class Client(ZulipClient):
         if result["result"] != "success":
             return False  # TODO?
 
+        canon_stream_name: CanonStream = CanonStream(stream_name)
         for stream in result["streams"]:
-            if stream_names_equal(stream["name"], stream_name):
+            if stream_names_equal(stream["name"], canon_stream_name):
                 return bool(stream["invite_only"])
 
         return False
@@ -326,11 +334,13 @@ class Client(ZulipClient):
 
     def send_response(self, response: Response) -> dict[str, Any]:
         """Send one single response."""
-        logging.debug("send_response: %s", str(response))
+        # Let logging call str() lazily, which only serializes the
+        # response if debug logging is actually enabled.
+        logging.debug("send_response: %s", response)
 
-        if response.message_type == MessageType.MESSAGE:
+        if response.message_type is MessageType.MESSAGE:
             return self.send_message(response.response)
-        if response.message_type == MessageType.EMOJI:
+        if response.message_type is MessageType.EMOJI:
             return self.add_reaction(response.response)
         return {}
 
@@ -520,10 +530,10 @@ class Client(ZulipClient):
         if result["result"] != "success":
             return None
 
-        match = re.search(Regex._USER_ID_PATTERN, result["rendered"])
+        match = Regex._USER_ID_PATTERN.search(result["rendered"])
         if not match:
             return None
-        return int(match.groupdict()["id"])
+        return int(match.group("id"))
 
     def get_stream_id_by_name(self, stream_name: str) -> int | None:
         request = {
@@ -534,10 +544,10 @@ class Client(ZulipClient):
         if result["result"] != "success":
             return None
 
-        match = re.search(Regex._STREAM_ID_PATTERN, result["rendered"])
+        match = Regex._STREAM_ID_PATTERN.search(result["rendered"])
         if not match:
             return None
-        return int(match.groupdict()["id"])
+        return int(match.group("id"))
 
     def get_group_id_by_name(self, group_name: str) -> int | None:
         request = {
@@ -548,10 +558,10 @@ class Client(ZulipClient):
         if result["result"] != "success":
             return None
 
-        match = re.search(Regex._USER_GROUP_ID_PATTERN, result["rendered"])
+        match = Regex._USER_GROUP_ID_PATTERN.search(result["rendered"])
         if not match:
             return None
-        return int(match.groupdict()["id"])
+        return int(match.group("id"))
 
     def get_stream_by_id(self, stream_id: int) -> dict[str, Any] | None:
         stream_result = self.call_endpoint(url=f"/streams/{stream_id}", method="GET")
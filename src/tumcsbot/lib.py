@@ -7,6 +7,7 @@
 
 Classes:
 --------
+CanonStream     A case-folded stream name.
 MessageType     Enum describing the type of a message.
 Regex           Some widely used regex methods.
 CommandParser   A simple positional argument parser.
@@ -21,21 +22,28 @@ stream_names_equal  Decide whether two stream names are equal.
 """
 
 import json
+import os
+import queue
 import re
 import regex
 import shlex
 import sqlite3 as sqlite
+import sys
+import threading
 from argparse import Namespace
 from enum import Enum
+from functools import lru_cache
 from importlib import import_module
 from inspect import cleandoc, getmembers, isclass, ismodule
-from itertools import repeat
 from os.path import isabs
-from typing import Any, Callable, Final, Iterable, Type, TypeVar, cast
+from typing import Any, Callable, Final, Iterable, Sequence, Type, TypeVar, cast
 
 
 T = TypeVar("T")
 
+# Marker for missing dict entries where None is a valid value.
+_MISSING: Final[object] = object()
+
 
 LOGGING_FORMAT: Final[
     str
@@ -51,6 +59,21 @@ class StrEnum(str, Enum):
     """
 
 
+class CanonStream(str):
+    """A case-folded stream name.
+
+    Canonicalize a stream name once in order to compare it to other
+    stream names repeatedly. See stream_names_equal().
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, stream_name: str) -> "CanonStream":
+        if isinstance(stream_name, CanonStream):
+            return stream_name
+        return str.__new__(cls, stream_name.casefold())
+
+
 class MessageType(StrEnum):
     """Represent the type of a message.
 
@@ -65,7 +88,11 @@ class MessageType(StrEnum):
 
 
 class Regex:
-    """Some widely used regex methods."""
+    """Some widely used regex methods.
+
+    The results of the get_* methods are cached since the same names
+    tend to show up again and again.
+    """
 
     _USER_ARGUMENT_PATTERN = regex.compile(r"@_?\*\*.*?\*\*\s*")
     _GROUP_ARGUMENT_PATTERN = regex.compile(r"@_?\*.*?\*\s*")
@@ -82,14 +109,22 @@ class Regex:
         r"data-user-group-id=\"(?P<id>\d+)\""
     )
 
+    # A quoted argument ends at the first unescaped closing quote. Its
+    # characters are matched possessively, so unterminated quotes cannot
+    # lead to exponential backtracking. Other arguments must not start
+    # with a quote, so that the pattern stops in front of an unterminated
+    # quote. CommandParser.parse() rejects such commands.
     _ARGUMENT_PATTERN = regex.compile(
-        r"(?P<args>@_?\*\*.*?\*\*\s*|@_\*.*?\*\s*|#\*\*.*?\*\*\s*|'(\\\\|\\.|.)*?'\s*|"
-        + r'"(\\\\|\\.|.)*?"\s*'
-        + r"|\S*\s*)*"
+        r"(?P<args>@_?\*\*.*?\*\*\s*|@_\*.*?\*\s*|#\*\*.*?\*\*\s*|"
+        + r"'(?:[^'\\\n]|\\.)*+'\s*|"
+        + r'"(?:[^"\\\n]|\\.)*+"\s*'
+        + r"|(?:[^\s'\"]\S*)?\s*)*"
     )
+    # ASCII commands without any of these characters consist of plain
+    # tokens only, see CommandParser.parse().
+    _SPECIAL_ARGUMENT_CHARS: Final[re.Pattern[str]] = re.compile(r"[\\'\"*]")
+    _PLAIN_ARGUMENT_PATTERN: Final[re.Pattern[str]] = re.compile(r"[^ \t\n\v\f\r]+")
 
-    _ASTERISKS: Final[re.Pattern[str]] = re.compile(r"(?:\*\*)")
-    _OPT_ASTERISKS: Final[re.Pattern[str]] = re.compile(r"(?:{}|)".format(_ASTERISKS))
     _EMOJI: Final[re.Pattern[str]] = re.compile(r"[^:]+")
     _EMOJI_AUTOCOMPLETED_CAPTURE: Final[re.Pattern[str]] = re.compile(
         r":({}):".format(_EMOJI.pattern)
@@ -99,72 +134,79 @@ class Regex:
     # by Zulip. That is why we cannot enforce sensible restrictions here.
     _STREAM: Final[re.Pattern[str]] = re.compile(r".+")
     _STREAM_AUTOCOMPLETED_CAPTURE: Final[re.Pattern[str]] = re.compile(
-        r"#{0}({1}){0}".format(_ASTERISKS.pattern, _STREAM.pattern)
+        r"#\*\*({})\*\*".format(_STREAM.pattern)
     )
+    # The stream name is matched possessively: it ends at the first ">",
+    # so there is no point in backtracking into it.
     _STREAM_AND_TOPIC_AUTOCOMPLETED_CAPTURE: Final[re.Pattern[str]] = re.compile(
-        r"#{0}({1})>({2}){0}".format(_ASTERISKS.pattern, r"[^>]+", _TOPIC.pattern)
+        r"#\*\*([^>]++)>({})\*\*".format(_TOPIC.pattern)
     )
     _USER: Final[re.Pattern[str]] = re.compile(r"[^\*\`\\\>\"\@]+")
-    _USER_AUTOCOMPLETED_TEMPLATE: str = r"{0}({1}){0}".format(
-        _ASTERISKS.pattern, _USER.pattern
-    )
-    _USER_AUTOCOMPLETED_ID_TEMPLATE: str = r"{0}({1})\|(\d+){0}".format(
-        _ASTERISKS.pattern, _USER.pattern
+    # Mentioned (@**name**) or linked (@_**name**) user, optionally
+    # including the user id (@**name|1234**). The name is matched lazily,
+    # because it may contain "|" itself.
+    _USER_AUTOCOMPLETED_CAPTURE: Final[re.Pattern[str]] = re.compile(
+        r"@_?\*\*({}?)(?:\|(\d+))?\*\*".format(_USER.pattern)
     )
-    _USER_LINKED_CAPTURE: Final[re.Pattern[str]] = re.compile(
-        r"@_" + _USER_AUTOCOMPLETED_TEMPLATE
+
+    # Alternations of the patterns above as used by the get_* methods.
+    # Every alternative is wrapped in a named group, so that lastgroup
+    # tells which one matched. The dicts map the names of the
+    # alternatives to the ids of the groups to extract.
+    _EMOJI_NAME: Final[re.Pattern[str]] = re.compile(
+        r"(?P<autocompleted>{})|(?P<plain>{})".format(
+            _EMOJI_AUTOCOMPLETED_CAPTURE.pattern, _EMOJI.pattern
+        )
     )
-    _USER_MENTIONED_CAPTURE: Final[re.Pattern[str]] = re.compile(
-        r"@" + _USER_AUTOCOMPLETED_TEMPLATE
+    _EMOJI_NAME_GROUPS: Final[dict[str, tuple[int, ...]]] = {
+        "autocompleted": (2,),
+        "plain": (3,),
+    }
+    _STREAM_NAME: Final[re.Pattern[str]] = re.compile(
+        r"(?P<autocompleted>{})|(?P<plain>{})".format(
+            _STREAM_AUTOCOMPLETED_CAPTURE.pattern, _STREAM.pattern
+        )
     )
-    _USER_LINKED_ID_CAPTURE: Final[re.Pattern[str]] = re.compile(
-        r"@_" + _USER_AUTOCOMPLETED_ID_TEMPLATE
+    _STREAM_NAME_GROUPS: Final[dict[str, tuple[int, ...]]] = {
+        "autocompleted": (2,),
+        "plain": (3,),
+    }
+    _STREAM_AND_TOPIC_NAME: Final[re.Pattern[str]] = re.compile(
+        r"(?P<topic>{})|(?P<autocompleted>{})|(?P<plain>{})".format(
+            _STREAM_AND_TOPIC_AUTOCOMPLETED_CAPTURE.pattern,
+            _STREAM_AUTOCOMPLETED_CAPTURE.pattern,
+            _STREAM.pattern,
+        )
     )
-    _USER_MENTIONED_ID_CAPTURE: Final[re.Pattern[str]] = re.compile(
-        r"@" + _USER_AUTOCOMPLETED_ID_TEMPLATE
+    _STREAM_AND_TOPIC_NAME_GROUPS: Final[dict[str, tuple[int, ...]]] = {
+        "topic": (2, 3),
+        "autocompleted": (5,),
+        "plain": (6,),
+    }
+    # Groups: 1 - autocompleted name, 2 - user id, 3 - plain name
+    _USER_NAME: Final[re.Pattern[str]] = re.compile(
+        r"{}|({})".format(_USER_AUTOCOMPLETED_CAPTURE.pattern, _USER.pattern)
     )
 
     @staticmethod
-    def get_captured_string_from_match(
-        match: re.Match[str] | None, capture_group_id: int
-    ) -> str | None:
-        """Return the string of a capture group from a match.
-
-        Return None if the match is None or if there is no capture group
-        with the given index or if the expression of the capture group
-        in the original regular expression could not be matched.
-        """
-        if match is None:
-            return None
-        try:
-            return match.group(capture_group_id)
-        except:
-            return None
-
-    @classmethod
-    def get_captured_strings_from_pattern_or(
-        cls, patterns: list[tuple[re.Pattern[str], list[int]]], string: str
+    def get_captured_strings_from_alternation(
+        pattern: re.Pattern[str], group_ids: dict[str, tuple[int, ...]], string: str
     ) -> list[str] | None:
         """Extract a substring from a string.
 
-        Walk through the provided patterns, find the first that matchs
-        the given string (fullmatch) and extract the capture groups with
-        the given ids.
-        Return None if there has been no matching pattern.
+        Match the given string against the pattern (fullmatch). The
+        top-level alternatives of the pattern have to be named groups.
+        Extract the capture groups with the ids given for the matching
+        alternative.
+        Return None if the pattern does not match.
         """
-        for pattern, group_ids in patterns:
-            match: re.Match[str] | None = pattern.fullmatch(string)
-            if match is None:
-                continue
-            result: list[str | None] = [
-                cls.get_captured_string_from_match(match, group_id)
-                for group_id in group_ids
-            ]
-            return None if None in result else cast(list[str], result)
-
-        return None
+        match: re.Match[str] | None = pattern.fullmatch(string)
+        if match is None or match.lastgroup is None:
+            return None
+        return [match.group(group_id) for group_id in group_ids[match.lastgroup]]
 
     @classmethod
+    @lru_cache(maxsize=4096)
     def get_emoji_name(cls, string: str) -> str | None:
         """Extract the emoji name from a string.
 
@@ -175,12 +217,13 @@ class Regex:
         Leading/trailing whitespace is discarded.
         Return None if no match could be found.
         """
-        result: list[str] | None = cls.get_captured_strings_from_pattern_or(
-            [(cls._EMOJI_AUTOCOMPLETED_CAPTURE, [1]), (cls._EMOJI, [0])], string.strip()
+        result: list[str] | None = cls.get_captured_strings_from_alternation(
+            cls._EMOJI_NAME, cls._EMOJI_NAME_GROUPS, string.strip()
         )
         return None if not result else result[0]
 
     @classmethod
+    @lru_cache(maxsize=4096)
     def get_stream_name(cls, string: str) -> str | None:
         """Extract the stream name from a string.
 
@@ -191,13 +234,19 @@ class Regex:
         Leading/trailing whitespace is discarded.
         Return None if no match could be found.
         """
-        result: list[str] | None = cls.get_captured_strings_from_pattern_or(
-            [(cls._STREAM_AUTOCOMPLETED_CAPTURE, [1]), (cls._STREAM, [0])],
-            string.strip(),
+        string = string.strip()
+        # Fast path for the common case of autocompleted stream names.
+        if len(string) > 5 and string.startswith("#**") and string.endswith("**"):
+            stream_name: str = string[3:-2]
+            if "\n" not in stream_name:
+                return stream_name
+        result: list[str] | None = cls.get_captured_strings_from_alternation(
+            cls._STREAM_NAME, cls._STREAM_NAME_GROUPS, string
         )
         return None if not result else result[0]
 
     @classmethod
+    @lru_cache(maxsize=4096)
     def get_stream_and_topic_name(cls, string: str) -> tuple[str, str | None] | None:
         """Extract the stream and the topic name from a string.
 
@@ -214,12 +263,9 @@ class Regex:
         This is related to the current behavior of the Zulip server and
         would need to be changed there.
         """
-        result: list[str] | None = cls.get_captured_strings_from_pattern_or(
-            [
-                (cls._STREAM_AND_TOPIC_AUTOCOMPLETED_CAPTURE, [1, 2]),
-                (cls._STREAM_AUTOCOMPLETED_CAPTURE, [1]),
-                (cls._STREAM, [0]),
-            ],
+        result: list[str] | None = cls.get_captured_strings_from_alternation(
+            cls._STREAM_AND_TOPIC_NAME,
+            cls._STREAM_AND_TOPIC_NAME_GROUPS,
             string.strip(),
         )
         return (
@@ -227,6 +273,7 @@ class Regex:
         )
 
     @classmethod
+    @lru_cache(maxsize=4096)
     def get_user_name(
         cls, string: str, get_user_id: bool = False
     ) -> str | tuple[str, int | None] | None:
@@ -243,24 +290,15 @@ class Regex:
         Leading/trailing whitespace is discarded.
         Return None if no match could be found.
         """
-        result: list[str] | None = cls.get_captured_strings_from_pattern_or(
-            [
-                (cls._USER_MENTIONED_ID_CAPTURE, [1, 2]),
-                (cls._USER_LINKED_ID_CAPTURE, [1, 2]),
-                (cls._USER_MENTIONED_CAPTURE, [1]),
-                (cls._USER_LINKED_CAPTURE, [1]),
-                (cls._USER, [0]),
-            ],
-            string.strip(),
-        )
-        if not result:
+        match: re.Match[str] | None = cls._USER_NAME.fullmatch(string.strip())
+        if match is None:
             return None
+        name: str = match.group(1) or match.group(3)
         if not get_user_id:
-            return result[0]
-        if len(result) == 1:
-            # We wanted the user ID, but did not find it.
-            return (result[0], None)
-        return (result[0], int(result[1]))
+            return name
+        user_id: str | None = match.group(2)
+        # We may have wanted the user ID, but did not find it.
+        return (name, None if user_id is None else int(user_id))
 
     @staticmethod
     def match_user_argument(s: str) -> str:
@@ -335,6 +373,7 @@ class CommandParser:
                 dict[str, Callable[[str], Any]],
                 dict[str, Callable[[str], Any]],
                 str | None,
+                dict[str, Any],
             ],
         ] = {}
 
@@ -390,7 +429,19 @@ class CommandParser:
         if not name:
             raise self.IllegalCommandParserState()
 
-        self.commands[name] = (opts, args, optionals, greedy, description)
+        # Values of the options which are not present on the command
+        # line: False for flags, None for options taking an argument.
+        opts_defaults: dict[str, Any] = {
+            opt: False if converter is None else None for opt, converter in opts.items()
+        }
+        self.commands[name] = (
+            opts,
+            args,
+            optionals,
+            greedy,
+            description,
+            opts_defaults,
+        )
         return True
 
     @staticmethod
@@ -415,24 +466,36 @@ class CommandParser:
 
         # Split on tokens.
 
-        matches_opt: regex.regex.Match[str] | None = Regex._ARGUMENT_PATTERN.match(
-            command
-        )
-        if not matches_opt:
-            return None
+        tokens: list[str] | None
+        if command.isascii() and not Regex._SPECIAL_ARGUMENT_CHARS.search(command):
+            # Fast path: there are no mentions, quotes or escape sequences
+            # to care about, so the tokens do not need any decoding.
+            tokens = [
+                token
+                for token in map(
+                    str.strip, Regex._PLAIN_ARGUMENT_PATTERN.findall(command)
+                )
+                if token
+            ]
+        else:
+            matches_opt: regex.regex.Match[str] | None = (
+                Regex._ARGUMENT_PATTERN.match(command)
+            )
+            if not matches_opt or matches_opt.end() != len(command):
+                return None
 
-        matches: regex.regex.Match[str] = matches_opt
-        try:
-            tokens: list[str] | None = [
-                bytes(e, "Latin-1").decode("unicode-escape")
-                for e in [
-                    CommandParser.strip_quotes(e)
-                    for e in matches.capturesdict()["args"]
+            matches: regex.regex.Match[str] = matches_opt
+            try:
+                tokens = [
+                    bytes(e, "Latin-1").decode("unicode-escape")
+                    for e in [
+                        CommandParser.strip_quotes(e)
+                        for e in matches.capturesdict()["args"]
+                    ]
+                    if e
                 ]
-                if e
-            ]
-        except Exception as e:
-            return None
+            except Exception as e:
+                return None
         if not tokens or len(tokens) == 0:
             return None
         # Get the fitting subcommand.
@@ -440,7 +503,14 @@ class CommandParser:
         if subcommand not in self.commands:
             return None
 
-        opts, positional, optional, greedy, description = self.commands[subcommand]
+        (
+            opts,
+            positional,
+            optional,
+            greedy,
+            description,
+            opts_defaults,
+        ) = self.commands[subcommand]
 
         optiones_first = []
         arguments_last = []
@@ -458,7 +528,9 @@ class CommandParser:
             else:
                 arguments_last.append(t)
 
-        result_opts = self._parse_opts(opts, optiones_first + arguments_last)
+        result_opts = self._parse_opts(
+            opts, opts_defaults, optiones_first + arguments_last
+        )
 
         if result_opts is None:
             return None
@@ -488,7 +560,7 @@ class CommandParser:
         return "\n".join(
             [
                 f"## `{name}`\n{desc}"
-                for name, (_, _, _, _, desc) in self.commands.items()
+                for name, (_, _, _, _, desc, _) in self.commands.items()
             ]
         )
 
@@ -501,9 +573,10 @@ class CommandParser:
             dict[str, Callable[[str], Any]],
             dict[str, Callable[[str], Any]],
             str | None,
+            dict[str, Any],
         ],
     ) -> str:
-        options, positional, optional, greedy, _ = arguments
+        options, positional, optional, greedy, _, _ = arguments
 
         optarg: Callable[[str], str] = (
             lambda x: " arg" if x in options and options[x] is not None else ""
@@ -585,22 +658,24 @@ class CommandParser:
     def _parse_opts(
         self,
         opts: dict[str, Callable[[Any], Any] | None],
+        opts_defaults: dict[str, Any],
         tokens: list[str],
     ) -> tuple[dict[str, Any], list[str]] | None:
         """Parse options from tokens.
 
         Return the parsed options together with their converted
-        arguments and the non-option tokens.
+        arguments and the non-option tokens. Options not present in
+        the tokens get their value from opts_defaults.
         Return None on error.
         """
         index: int = 0
-        result: dict[str, Any] = {}
         token: str = ""
 
         opts_len: int = len(opts)
         if not opts_len:
             return ({}, tokens)
 
+        result: dict[str, Any] = opts_defaults.copy()
         skip_next_token = False
         for index in range(len(tokens)):
             if skip_next_token:
@@ -612,19 +687,20 @@ class CommandParser:
                 break
 
             opt: str
-            if token.startswith("-") and not token.startswith("--"):
+            short_opt: bool = not token.startswith("--")
+            if short_opt:
                 opt = token[1]
             else:
                 opt = token[2:]
 
-            if not opt in opts:
+            converter: Any = opts.get(opt, _MISSING)
+            if converter is _MISSING:
                 # Invalid option.
                 return None
             try:
-                converter: Callable[[Any], Any] | None = opts[opt]
                 if converter is not None:
                     optarg: str | None
-                    if token.startswith("-") and not token.startswith("--"):
+                    if short_opt:
                         optarg = token[2:]
                     else:
                         optarg = tokens[index + 1] if index + 1 < len(tokens) else None
@@ -633,20 +709,13 @@ class CommandParser:
 
                 else:
                     result[opt] = True
-            except:
+            except Exception:
                 return None
 
         # Skip last option if there have been only options.
         if token and token[0] == "-":
             index += 1
 
-        # Mark all non-existant flags as False and fill the values of
-        # all the other options which were not specified on the given
-        # command line with None.
-        for opt in opts:
-            if opt not in result:
-                result[opt] = False if opts[opt] is None else None
-
         # Remove all backslash escapes for "-".
         # Note that split() in self.parse() already converted the two
         # backslashes to a single one!
@@ -660,17 +729,30 @@ class Conf:
     _update_sql: str = "replace into Conf values (?,?)"
 
     def __init__(self, db: "DB | None" = None) -> None:
+        # Only close the database connection if it is our own.
+        self._own_db: bool = db is None
         self._db: DB = DB() if db is None else db
         self._db.checkout_table("Conf", "(Key text primary key, Value text not null)")
 
+    def close(self) -> None:
+        """Return the own database connection to the pool (if any).
+
+        Do not use this object anymore afterwards.
+        """
+        if self._own_db:
+            self._db.close()
+
     def get(self, key: str) -> str | None:
-        result: list[tuple[Any, ...]] = self._db.execute(self._get_sql, key)
-        if not result or len(result[0]) != 1:
-            return None
-        return cast(str, result[0][0])
+        row: tuple[Any, ...] | None = self._db.connection.execute(
+            self._get_sql, (key,)
+        ).fetchone()
+        return None if row is None else cast(str, row[0])
 
     def list(self) -> list[tuple[str, str]]:
-        return cast(list[tuple[str, str]], self._db.execute(self._list_sql))
+        return cast(
+            list[tuple[str, str]],
+            self._db.connection.execute(self._list_sql).fetchall(),
+        )
 
     def remove(self, key: str) -> None:
         self._db.execute(self._remove_sql, key, commit=True)
@@ -684,10 +766,177 @@ class Conf:
         self._db.execute(self._update_sql, key, value, commit=True)
 
 
+class _DBPool:
+    """Process-wide pool of sqlite connections used by DB.
+
+    Connections are pooled per database path and connection arguments.
+    Unless check_same_thread is False, connections are additionally
+    pooled per thread, because sqlite connections may only be used by
+    the thread which created them. The process id is part of the key as
+    well, so that connections are never shared with forked processes.
+
+    Every pooled connection is stored together with the set of tables
+    already checked out on it (see DB.checkout_table()).
+    """
+
+    max_size: int = 8
+    # Pooled connections are hardly ever closed, so let sqlite update its
+    # query planner statistics on every n-th returned writable connection.
+    optimize_interval: int = 1000
+    _check_ins: int = 0
+    _lock: threading.Lock = threading.Lock()
+    _pools: dict[
+        tuple[Any, ...], "queue.Queue[tuple[sqlite.Connection, set[str]]]"
+    ] = {}
+    # Pools inherited from the parent process. They are kept referenced,
+    # but never used, so that the child does not close the connections
+    # of its parent when they are garbage collected.
+    _inherited: list[
+        dict[tuple[Any, ...], "queue.Queue[tuple[sqlite.Connection, set[str]]]"]
+    ] = []
+
+    @staticmethod
+    def key(
+        db_path: str, read_only: bool, args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> tuple[Any, ...] | None:
+        """Get the pool key for the given connection parameters.
+
+        Return None if the parameters are not hashable.
+        """
+        thread_id: int | None = (
+            threading.get_ident() if kwargs.get("check_same_thread", True) else None
+        )
+        key: tuple[Any, ...] = (
+            os.getpid(),
+            thread_id,
+            db_path,
+            read_only,
+            args,
+            tuple(sorted(kwargs.items())),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    @classmethod
+    def acquire(
+        cls, key: tuple[Any, ...] | None
+    ) -> tuple[sqlite.Connection, set[str]] | None:
+        """Get a pooled connection and its checked out tables.
+
+        Return None if there is no pooled connection.
+        """
+        if key is None:
+            return None
+        with cls._lock:
+            pool: "queue.Queue[tuple[sqlite.Connection, set[str]]] | None" = (
+                cls._pools.get(key)
+            )
+        if pool is None:
+            return None
+        try:
+            return pool.get_nowait()
+        except queue.Empty:
+            return None
+
+    @staticmethod
+    def close(connection: sqlite.Connection, read_only: bool) -> None:
+        """Close a connection for good.
+
+        Let sqlite update its query planner statistics and checkpoint
+        the WAL first, so that the next user does not have to.
+        """
+        connection.rollback()
+        if not read_only:
+            try:
+                connection.execute("pragma optimize")
+                connection.execute("pragma wal_checkpoint(PASSIVE)")
+            except sqlite.Error:
+                pass
+        connection.close()
+
+    @classmethod
+    def reset_after_fork(cls) -> None:
+        """Reset the pool in a forked child process.
+
+        The lock might have been held by another thread of the parent at
+        the time of the fork, so it has to be replaced.
+        """
+        cls._lock = threading.Lock()
+        cls._inherited.append(cls._pools)
+        cls._pools = {}
+
+    @staticmethod
+    def optimize(connection: sqlite.Connection) -> None:
+        """Let sqlite update its query planner statistics if necessary."""
+        try:
+            connection.execute("pragma optimize")
+        except sqlite.Error:
+            pass
+
+    @classmethod
+    def release(
+        cls,
+        key: tuple[Any, ...] | None,
+        connection: sqlite.Connection,
+        tables: set[str],
+        read_only: bool,
+    ) -> None:
+        """Return a connection to the pool or close it if the pool is full."""
+        if key is None:
+            cls.close(connection, read_only)
+            return
+        connection.rollback()
+        optimize: bool = False
+        with cls._lock:
+            pool: "queue.Queue[tuple[sqlite.Connection, set[str]]]" = (
+                cls._pools.setdefault(key, queue.Queue(cls.max_size))
+            )
+            if not read_only:
+                cls._check_ins += 1
+                optimize = cls._check_ins % cls.optimize_interval == 0
+        if optimize:
+            cls.optimize(connection)
+        try:
+            pool.put_nowait((connection, tables))
+        except queue.Full:
+            cls.close(connection, read_only)
+
+
+os.register_at_fork(after_in_child=_DBPool.reset_after_fork)
+
+
 class DB:
-    """Simple wrapper class to conveniently access a sqlite database."""
+    """Simple wrapper class to conveniently access a sqlite database.
+
+    Connections are taken from and - on close() - returned to a
+    process-wide pool.
+    """
 
     path: str | None = None
+    # Pragmas to apply to every new (read-only) connection.
+    # Note that sqlite.connect() already sets a busy timeout of five
+    # seconds by default.
+    pragmas: list[str] = [
+        "foreign_keys = on",
+        "journal_mode = WAL",
+        "synchronous = NORMAL",
+        "temp_store = MEMORY",
+        "cache_size = -20000",
+        "mmap_size = 268435456",
+    ]
+    read_only_pragmas: list[str] = [
+        "foreign_keys = on",
+        "query_only = 1",
+        "cache_size = -20000",
+        "mmap_size = 268435456",
+    ]
+    # Statements which may remove tables that have been checked out.
+    _schema_change_pattern: Final[re.Pattern[str]] = re.compile(
+        r"\s*(?:drop|alter)\b", re.IGNORECASE
+    )
 
     def __init__(
         self,
@@ -713,6 +962,24 @@ class DB:
             raise ValueError("path to database is not absolute")
 
         self.read_only: bool = read_only
+        # The bot uses quite a lot of different statements. Keep them
+        # prepared (sqlite.connect() caches 128 by default).
+        kwargs.setdefault("cached_statements", 256)
+        self._pool_key: tuple[Any, ...] | None = _DBPool.key(
+            db_path, read_only, args, kwargs
+        )
+        pooled: tuple[sqlite.Connection, set[str]] | None = _DBPool.acquire(
+            self._pool_key
+        )
+        # Tables already checked out on this connection.
+        self._checked_tables: set[str]
+        if pooled is not None:
+            self.connection, self._checked_tables = pooled
+            self.cursor = self.connection.cursor()
+            return
+
+        self._checked_tables = set()
+
         if self.read_only:
             kwargs.update(uri=True)
             self.connection = sqlite.connect(
@@ -722,8 +989,12 @@ class DB:
             self.connection = sqlite.connect(db_path, *args, **kwargs)
 
         self.cursor = self.connection.cursor()
-        # Switch on foreign key support.
-        self.execute("pragma foreign_keys = on")
+        self.cursor.executescript(
+            "".join(
+                f"pragma {pragma};"
+                for pragma in (self.read_only_pragmas if read_only else self.pragmas)
+            )
+        )
 
     def checkout_table(self, table: str, schema: str) -> None:
         """Create table if it does not already exist.
@@ -735,11 +1006,29 @@ class DB:
                     '(Name Type, ...)' --> valid SQL!
 
         Since this is only for internal use, screw SQL injections :)
+        Nevertheless, the table name has to be a valid identifier,
+        because it cannot be passed as SQL parameter.
+
+        A table is only checked out once per connection, until a
+        statement fails or changes the schema.
         """
+        if table in self._checked_tables:
+            return
+        if not table.isidentifier():
+            raise ValueError(f"invalid table name: {table!r}")
         self.execute(f"create table if not exists {table} {schema};", commit=True)
+        self._checked_tables.add(table)
 
     def close(self) -> None:
-        self.connection.close()
+        """Return the connection to the pool.
+
+        Uncommitted changes are rolled back.
+        Do not use this object anymore afterwards.
+        """
+        self.cursor.close()
+        _DBPool.release(
+            self._pool_key, self.connection, self._checked_tables, self.read_only
+        )
 
     def execute(
         self, command: str, *args: Any, commit: bool = False
@@ -750,56 +1039,88 @@ class DB:
         (if commit == True) and return the result of the command.
         Forward 'args' to cursor.execute()
         """
+        if self._checked_tables and self._schema_change_pattern.match(command):
+            self._checked_tables.clear()
         try:
-            result: sqlite.Cursor = self.cursor.execute(command, args)
+            if commit and not self.read_only:
+                # The connection commits on success and rolls back on any
+                # exception.
+                with self.connection:
+                    return self.cursor.execute(command, args).fetchall()
+            return self.cursor.execute(command, args).fetchall()
         except sqlite.Error as e:
+            # A checked out table may have been removed by another
+            # connection.
+            self._checked_tables.clear()
+            self.connection.rollback()
+            raise e
+
+    def execute_many(
+        self, command: str, args_iter: Iterable[Sequence[Any]], commit: bool = False
+    ) -> None:
+        """Execute an sql command for every set of arguments.
+
+        Execute an sql command once for every element of 'args_iter'
+        (forwarded to cursor.executemany()) and save the new database
+        state (if commit == True). All executions belong to the same
+        transaction.
+        """
+        try:
+            if commit and not self.read_only:
+                with self.connection:
+                    self.cursor.executemany(command, args_iter)
+                return
+            self.cursor.executemany(command, args_iter)
+        except sqlite.Error as e:
+            self._checked_tables.clear()
             self.connection.rollback()
             raise e
-        if commit and not self.read_only:
-            self.connection.commit()
-        return result.fetchall()
 
 
 class Response:
     """Some useful methods for building a response message."""
 
+    __slots__ = ("message_type", "response")
+
     privilege_err_msg: str = cleandoc(
         """
-        Hi {}!
+        Hi %s!
         You don't have sufficient privileges to execute this command.
         """
     )
     command_not_found_msg: str = cleandoc(
         """
-        Hi {}!
+        Hi %s!
         Unfortunately, I currently cannot understand what you wrote to me.
         Try "help" to get a glimpse of what I am capable of. :-)
         """
     )
     exception_msg: str = cleandoc(
         """
-        Hi {}!
+        Hi %s!
         An exception occurred while executing your request.
         Did you try to hack me? ;-)
         """
     )
     error_msg: str = cleandoc(
         """
-        Sorry, {}, an error occurred while executing your request.
+        Sorry, %s, an error occurred while executing your request.
         """
     )
     request_msg: str = cleandoc(
         """
-        Hi {}!
+        Hi %s!
         Your input would lead to the execution of the following command.
         Do you want to execute this? If yes, please react with :check: to this message.
-        original_message_id: {}
-        command: {}
+        original_message_id: %s
+        command: %s
         """
     )
-    greet_msg: str = "Hi {}! :-)"
+    greet_msg: str = "Hi %s! :-)"
     ok_emoji: str = "ok"
     no_emoji: str = "cross_mark"
+    # Shared "no response" object, set after the class body.
+    _none: "Response"
 
     def __init__(self, message_type: MessageType, response: dict[str, Any]) -> None:
         self.message_type: MessageType = message_type
@@ -810,12 +1131,13 @@ class Response:
 
     def __str__(self) -> str:
         return json.dumps(
-            {"message_type": str(self.message_type), "response": str(self.response)}
+            {"message_type": self.message_type.value, "response": self.response},
+            default=str,
         )
 
     def is_none(self) -> bool:
         """Check whether this response has the MessageType 'None'."""
-        return self.message_type == MessageType.NONE
+        return self.message_type is MessageType.NONE
 
     @classmethod
     def build_message(
@@ -911,7 +1233,7 @@ class Response:
         """
         return cls.build_message(
             message,
-            cls.request_msg.format(message["sender_full_name"], message["id"], command),
+            cls.request_msg % (message["sender_full_name"], message["id"], command),
         )
 
     @classmethod
@@ -922,7 +1244,7 @@ class Response:
         certain command.
         """
         return cls.build_message(
-            message, cls.privilege_err_msg.format(message["sender_full_name"])
+            message, cls.privilege_err_msg % message["sender_full_name"]
         )
 
     @classmethod
@@ -933,23 +1255,19 @@ class Response:
     @classmethod
     def error(cls, message: dict[str, Any]) -> "Response":
         """Tell the user that an error occurred."""
-        return cls.build_message(
-            message, cls.error_msg.format(message["sender_full_name"])
-        )
+        return cls.build_message(message, cls.error_msg % message["sender_full_name"])
 
     @classmethod
     def exception(cls, message: dict[str, Any]) -> "Response":
         """Tell the user that an exception occurred."""
         return cls.build_message(
-            message, cls.exception_msg.format(message["sender_full_name"])
+            message, cls.exception_msg % message["sender_full_name"]
         )
 
     @classmethod
     def greet(cls, message: dict[str, Any]) -> "Response":
         """Greet the user."""
-        return cls.build_message(
-            message, cls.greet_msg.format(message["sender_full_name"])
-        )
+        return cls.build_message(message, cls.greet_msg % message["sender_full_name"])
 
     @classmethod
     def ok(cls, message: dict[str, Any]) -> "Response":
@@ -963,24 +1281,140 @@ class Response:
 
     @classmethod
     def none(cls) -> "Response":
-        """No response."""
-        return cls(MessageType.NONE, {})
+        """No response.
+
+        The returned object is shared, so do not modify it.
+        """
+        return cls._none
 
 
-def get_classes_from_path(module_path: str, class_type: Type[T]) -> Iterable[Type[T]]:
-    plugin_classes: list[Type[T]] = []
+Response._none = Response(MessageType.NONE, {})
+
+
+def get_classes_from_path(module_path: str, class_type: Type[T]) -> tuple[Type[T], ...]:
+    """Get all classes of the given type defined in the given module.
+
+    The result is cached per (module_path, class_type).
+    """
+    # lru_cache() erases the signature of the cached helper, so the
+    # types are restored here. (And mypy only accepts a plain type as
+    # hashable cache key.)
+    base: type = class_type
+    return cast(tuple[Type[T], ...], _get_classes_from_path(module_path, base))
+
+
+@lru_cache(maxsize=64)
+def _get_classes_from_path(module_path: str, class_type: type) -> tuple[type, ...]:
+    plugin_classes: list[type] = []
     for _, module in getmembers(import_module(module_path), ismodule):
         for _, value in getmembers(module, isclass):
             if value.__module__ == module.__name__ and issubclass(value, class_type):
-                plugin_classes.append(value)  # pyright: ignore
+                plugin_classes.append(value)
 
-    return plugin_classes
+    # Return an immutable sequence, since it is shared between callers.
+    return tuple(plugin_classes)
 
 
 def is_bot_owner(user_id: int, db: DB | None = None) -> bool:
     """Checks whether the given user id belongs to the bot owner."""
     conf: Conf = Conf(db=db)
-    return conf.get("bot_owner") == str(user_id)
+    try:
+        return conf.get("bot_owner") == str(user_id)
+    finally:
+        conf.close()
+
+
+# The characters shlex considers to be whitespace by default.
+_SPLIT_DEFAULT_WHITESPACE: Final[str] = " \t\r\n"
+# Tokens of a string without quotes or backslashes for the default
+# whitespace. Note that str.split() would additionally split on other
+# whitespace characters, which shlex does not.
+_SPLIT_DEFAULT_TOKEN: Final[re.Pattern[str]] = re.compile(r"[^ \t\r\n]+")
+# Quoted parts of a token produced by _get_split_pattern().
+_SPLIT_QUOTED_PART: Final[re.Pattern[str]] = re.compile(r"\"([^\"]*)\"|'([^']*)'")
+
+
+@lru_cache(maxsize=None)
+def _get_split_token_pattern(whitespace: str) -> re.Pattern[str]:
+    """Get the fast path token pattern for split() given the separators.
+
+    Only for strings without quotes or backslashes.
+    """
+    return re.compile(rf"[^{re.escape(whitespace)}]+")
+
+
+@lru_cache(maxsize=None)
+def _get_split_pattern(whitespace: str) -> re.Pattern[str]:
+    """Get the tokenizer pattern for split() given the separators.
+
+    The pattern skips leading separators and captures the next token.
+    A token consists of unquoted parts and complete quoted parts, which
+    mirrors the behavior of shlex in posix mode for strings without
+    backslashes.
+    """
+    ws: str = re.escape(whitespace)
+    return re.compile(rf"[{ws}]*((?:[^{ws}\"']+|\"[^\"]*\"|'[^']*')+)?")
+
+
+def _tokenize(string: str, whitespace: str) -> list[str] | None:
+    """Split string into shell-like tokens using a precompiled pattern.
+
+    Return None if the tokenizer cannot handle the string (e.g., because
+    of an unbalanced quotation mark). The caller has to fall back to
+    shlex in this case.
+    """
+    match: Callable[[str, int], re.Match[str] | None] = _get_split_pattern(
+        whitespace
+    ).match
+    sub: Callable[..., str] = _SPLIT_QUOTED_PART.sub
+    tokens: list[str] = []
+    pos: int = 0
+    length: int = len(string)
+    while pos < length:
+        # The pattern cannot fail, since all of its parts are optional.
+        m: re.Match[str] = cast(re.Match[str], match(string, pos))
+        token: str | None = m.group(1)
+        if token is None:
+            if m.end() < length:
+                return None
+            break
+        if '"' in token or "'" in token:
+            token = sub(lambda q: q.group(1) or q.group(2) or "", token)
+        tokens.append(token)
+        pos = m.end()
+    return tokens
+
+
+def _get_split_lexer(string: str, sep: str | None) -> shlex.shlex:
+    """Get a pre-configured lexer for split() reading from string."""
+    lexer: shlex.shlex = shlex.shlex(
+        instream=string, posix=True, punctuation_chars=False
+    )
+    # Do not handle comments.
+    lexer.commenters = ""
+    # Split only on the characters specified as "whitespace".
+    lexer.whitespace_split = True
+    if sep:
+        lexer.whitespace = sep
+    return lexer
+
+
+def _exec_split_converter(conv: Callable[[str], Any], arg: str) -> Any:
+    """Apply a converter of split() to a token.
+
+    Return None if the converter raises an exception.
+    """
+    if conv is int:
+        # Fast path for the most common converter which avoids the
+        # exception machinery for plain decimal numbers.
+        digits: str = arg[1:] if arg[:1] in ("+", "-") else arg
+        if digits.isdecimal():
+            return int(arg)
+    try:
+        result: Any = conv(arg)
+    except Exception:
+        return None
+    return result
 
 
 def split(
@@ -988,11 +1422,14 @@ def split(
     sep: str | None = None,
     exact_split: int = 0,
     discard_empty: bool = True,
-    converter: list[Callable[[str], Any]] | None = None,
+    converter: tuple[Callable[[str], Any], ...] | None = None,
+    default_converter: Callable[[str], Any] | None = None,
 ) -> list[Any] | None:
     """Similar to the default split, but respects quotes.
 
-    Basically, it's a wrapper for shlex.
+    Basically, it's a wrapper for shlex. Strings without backslashes
+    (and quotes) are handled by faster tokenizers with the same
+    semantics.
 
     Arguments:
     ----------
@@ -1006,86 +1443,145 @@ def split(
                    discarding empty strings (if discard_empty is true).
     discard_empty  Discard empty strings as splitting result (before
                    applying any converter).
-    converter      A list of functions to be applied to each token.
-                   If there are more token than converter, the last
-                   converter will be used for every remaining token.
+    converter      A tuple of functions to be applied to the tokens
+                   (the i-th converter to the i-th token).
+                   If there are more token than converter, the
+                   default_converter (or, if not given, the last
+                   converter) will be used for every remaining token.
                    A converter may return None to indicate an error.
+    default_converter
+                   The function to be applied to every token without a
+                   dedicated converter.
 
     Whitespace around the resulting tokens will be removed.
     Return None if there has been an error.
     """
-
-    def exec_converter(conv: Callable[[str], Any], arg: str) -> Any:
-        try:
-            result: Any = conv(arg)
-        except:
-            return None
-        return result
-
     if string is None:
         return None
 
-    parser: shlex.shlex = shlex.shlex(
-        instream=string, posix=True, punctuation_chars=False
-    )
-    # Do not handle comments.
-    parser.commenters = ""
-    # Split only on the characters specified as "whitespace".
-    parser.whitespace_split = True
-    if sep:
-        parser.whitespace = sep
+    result: list[Any]
+    tokens: list[str] | None = None
+    if "\\" not in string:
+        if '"' not in string and "'" not in string:
+            # Fast path for the common case of plain commands.
+            tokens = (
+                _get_split_token_pattern(sep) if sep else _SPLIT_DEFAULT_TOKEN
+            ).findall(string)
+        else:
+            tokens = _tokenize(string, sep if sep else _SPLIT_DEFAULT_WHITESPACE)
 
+    source: Iterable[str] = (
+        tokens if tokens is not None else _get_split_lexer(string, sep)
+    )
     try:
-        result: list[Any] = list(map(str.strip, parser))
-    except:
+        # Strip the tokens and discard empty ones in a single pass.
+        if discard_empty:
+            result = [token for token in map(str.strip, source) if token]
+        else:
+            result = list(map(str.strip, source))
+    except ValueError:
+        # shlex could not parse the string, e.g., because of a
+        # missing closing quotation mark.
         return None
 
-    if discard_empty:
-        result = list(filter(lambda s: s, result))
-
     if exact_split > 0 and len(result) != exact_split:
         return None
 
-    if converter:
+    if converter or default_converter is not None:
         # Apply converter if present.
-        len_result: int = len(result)
-        len_converter: int = len(converter)
-
-        if len_converter < len_result:
-            converter.extend(repeat(converter[-1], len_result - len_converter))
-
+        converters: tuple[Callable[[str], Any], ...] = converter or ()
+        num_converters: int = len(converters)
+        fallback: Callable[[str], Any] = (
+            default_converter if default_converter is not None else converters[-1]
+        )
         result = [
-            exec_converter(conv, token) for (conv, token) in zip(converter, result)
+            _exec_split_converter(
+                converters[i] if i < num_converters else fallback, token
+            )
+            for i, token in enumerate(result)
         ]
 
     return result
 
 
+@lru_cache(maxsize=8192)
+def _casefold_stream_name(stream_name: str) -> str:
+    """Return the interned, case-folded form of a stream name."""
+    return sys.intern(stream_name.casefold())
+
+
 def stream_names_equal(stream_name1: str, stream_name2: str) -> bool:
     """Decide whether two stream names are equal.
 
     Currently, Zulip considers stream names to be case insensitive.
+    The case-folded names are cached and interned, so comparing them
+    boils down to an identity check. Identical names and names which
+    are already given as CanonStream are compared directly.
     """
-    return stream_name1.casefold() == stream_name2.casefold()
+    if stream_name1 == stream_name2:
+        return True
+    if isinstance(stream_name1, CanonStream) and isinstance(stream_name2, CanonStream):
+        return False
+    return _casefold_stream_name(stream_name1) is _casefold_stream_name(stream_name2)
+
+
+@lru_cache(maxsize=512)
+def compile_stream_regex(stream_reg: str) -> re.Pattern[str] | None:
+    """Compile a stream regex (case insensitive).
+
+    The compiled patterns are cached.
+    Return None in case the regex is invalid.
+    """
+    try:
+        return re.compile(stream_reg, flags=re.I)
+    except (re.error, ValueError):
+        # ValueError: the regex sets incompatible flags inline.
+        return None
+
+
+# Escapes which may behave differently with re.ASCII even on ASCII input.
+_NON_ASCII_SAFE_ESCAPES: Final[re.Pattern[str]] = re.compile(r"\\[sSuUN]")
+
+
+@lru_cache(maxsize=512)
+def _compile_ascii_stream_regex(stream_reg: str) -> re.Pattern[str] | None:
+    """Compile a stream regex (case insensitive) for ASCII stream names.
+
+    Case insensitive matching is considerably cheaper with re.ASCII.
+    For ASCII-only stream names, the resulting pattern behaves like the
+    one of compile_stream_regex() as long as the regex itself is ASCII
+    and does not contain any escapes whose meaning depends on re.ASCII.
+    Return None if this is not the case or if the regex is invalid.
+    """
+    if not stream_reg.isascii() or _NON_ASCII_SAFE_ESCAPES.search(stream_reg):
+        return None
+    try:
+        return re.compile(stream_reg, flags=re.I | re.ASCII)
+    except (re.error, ValueError):
+        # ValueError: the regex sets the re.UNICODE flag inline.
+        return None
 
 
 def stream_name_match(stream_reg: str, stream_name: str) -> bool:
     """Decide whether a stream regex matches a stream_name (fullmatch).
 
     Currently, Zulip considers stream names to be case insensitive.
+    An invalid regex does not match anything.
     """
-    return re.fullmatch(stream_reg, stream_name, flags=re.I) is not None
+    pattern: re.Pattern[str] | None = None
+    if stream_name.isascii():
+        pattern = _compile_ascii_stream_regex(stream_reg)
+    if pattern is None:
+        pattern = compile_stream_regex(stream_reg)
+    return pattern is not None and pattern.fullmatch(stream_name) is not None
 
 
 def validate_and_return_regex(regex: str | None) -> str | None:
     """Validate a regex and return it.
 
     Return None in case the regex is invalid.
+    The compiled regex is cached, see compile_stream_regex().
     """
-    if regex is None:
-        return None
-    try:
-        re.compile(regex)
-        return regex
-    except re.error:
+    if regex is None or compile_stream_regex(regex) is None:
         return None
+    return regex
@@ -17,7 +17,6 @@ PluginCommandMixin   Mixin class tailored for interactive commands.
 """
 
 from ctypes import c_bool
-import json
 import logging
 import multiprocessing
 import queue
@@ -72,14 +71,9 @@ class Event:
         self.reply_to: str = reply_to if reply_to is not None else sender
 
     def __repr__(self) -> str:
-        return json.dumps(
-            {
-                "sender": self.sender,
-                "type": self.type,
-                "data": str(self.data),
-                "dest": self.dest,
-                "reply_to": self.reply_to,
-            }
+        return (
+            f"Event(sender={self.sender!r}, type={self.type.value!r}, "
+            f"data={self.data!r}, dest={self.dest!r}, reply_to={self.reply_to!r})"
         )
 
     @classmethod
@@ -175,14 +169,20 @@ class _Plugin(ABC):
         # Set the running flag.
         self.running = multiprocessing.Value(c_bool, False)
 
-        # Initialize database entry for this plugin.
-        self._init_db()
-
     def _init_db(self) -> None:
         db: DB = DB()
-        db.execute(self._update_plugin_sql, self.plugin_name(), None, None, commit=True)
+        db.execute(self._update_plugin_sql, *self.get_db_entry(), commit=True)
         db.close()
 
+    def get_db_entry(self) -> tuple[str, str | None, str | None]:
+        """Get the entry of this plugin for the Plugins table.
+
+        Return a tuple containing the name, the syntax and the
+        description of the plugin. The root process writes the entries
+        of all plugins at once before starting them.
+        """
+        return (self.plugin_name(), None, None)
+
     def _init_plugin(self) -> None:
         """Custom plugin initialization code.
 
@@ -238,14 +238,14 @@ class _Plugin(ABC):
         Always call the default implementation of this method if you
         did not receive any custom internal event.
         """
-        if event.type == EventType.ZULIP:
+        if event.type is EventType.ZULIP:
             if not self.is_responsible(event):
                 return
             responses: Response | Iterable[Response] = self.handle_zulip_event(event)
             self.client.send_responses(responses)
-        elif event.type == EventType.RELOAD:
+        elif event.type is EventType.RELOAD:
             self.reload()
-        elif event.type == EventType.STOP:
+        elif event.type is EventType.STOP:
             pass
 
     @final
@@ -289,16 +289,23 @@ class _Plugin(ABC):
 
         self.logger.debug("started running")
         assert self.queue is not None
+        # The logging level is fixed for the lifetime of the plugin.
+        debug: bool = self.logger.isEnabledFor(logging.DEBUG)
+        # Avoid the attribute lookups in the loop below.
+        running = self.running
+        get_event: Callable[[], Event] = self.queue.get
+        handle_event: Callable[[Event], None] = self.handle_event
 
-        while self.running.value:  # type: ignore
-            event: Event = self.queue.get()
+        while running.value:  # type: ignore
+            event: Event = get_event()
 
-            if event.type == EventType._EMPTY:
+            if event.type is EventType._EMPTY:
                 break
 
-            self.logger.debug("received event %s", event)
+            if debug:
+                self.logger.debug("received event %s", event)
             try:
-                self.handle_event(event)
+                handle_event(event)
             except Exception as e:
                 self.logger.exception(e)
 
@@ -428,10 +435,8 @@ class PluginCommandMixin(_Plugin):
     events = _Plugin.events + [EventType.GET_USAGE]
 
     @final
-    def _init_db(self) -> None:
-        db: DB = DB()
-        db.execute(self._update_plugin_sql, *self.get_usage(), commit=True)
-        db.close()
+    def get_db_entry(self) -> tuple[str, str | None, str | None]:
+        return self.get_usage()
 
     def update_plugin_usage(self) -> None:
         self._init_db()
@@ -470,7 +475,7 @@ class PluginCommandMixin(_Plugin):
         return self.handle_message(event.data["message"])
 
     def handle_event(self, event: Event) -> None:
-        if event.type == EventType.GET_USAGE:
+        if event.type is EventType.GET_USAGE:
             self.plugin_context.push_loopback(
                 Event(
                     sender=self.plugin_name(),
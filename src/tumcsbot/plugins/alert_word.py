@@ -40,6 +40,8 @@ class AlertWord(PluginCommandMixin, PluginProcess):
         """
     )
     _list_sql: str = "select * from Alerts"
+    # Replace markdown links by their textual representation.
+    _markdown_links: re.Pattern[str] = re.compile(r"\[([^\]]*)\]\([^)]+\)")
     _remove_sql: str = "delete from Alerts where Phrase = ?"
     _select_sql: str = "select Phrase, Emoji from Alerts"
     _update_sql: str = "replace into Alerts values (?,?)"
@@ -63,8 +65,6 @@ class AlertWord(PluginCommandMixin, PluginProcess):
         # Initialize the plugin's daemon part.
         # Get pattern and the alert_phrase - emoji bindings.
         self._bindings: list[tuple[re.Pattern[str], str]] = self._get_bindings()
-        # Replace markdown links by their textual representation.
-        self._markdown_links: re.Pattern[str] = re.compile(r"\[([^\]]*)\]\([^\)]+\)")
 
         self._received_command: bool = False
 
@@ -97,9 +97,9 @@ class AlertWord(PluginCommandMixin, PluginProcess):
 
         if command == "list":
             result_sql = self._db.execute(self._list_sql)
-            response: str = "Alert word or phrase | Emoji\n---- | ----"
-            for phrase, emoji in result_sql:
-                response += f"\n`{phrase}` | {emoji} :{emoji}:"
+            response: str = "Alert word or phrase | Emoji\n---- | ----" + "".join(
+                f"\n`{phrase}` | {emoji} :{emoji}:" for phrase, emoji in result_sql
+            )
             return Response.build_message(message, response)
 
         # Use lowercase -> no need for case insensitivity.
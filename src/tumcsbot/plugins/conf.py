@@ -44,9 +44,9 @@ class ConfPlugin(PluginCommandMixin, PluginThread):
         command, _, args = result
 
         if command == "list":
-            response: str = "Key | Value\n ---- | ----"
-            for key, value in self._conf.list():
-                response += f"\n{key} | {value}"
+            response: str = "Key | Value\n ---- | ----" + "".join(
+                f"\n{key} | {value}" for key, value in self._conf.list()
+            )
             return Response.build_message(message, response)
 
         if command == "remove":
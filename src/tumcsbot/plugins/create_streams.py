@@ -41,7 +41,9 @@ class CreateStreams(PluginCommandMixin, PluginThread):
 
         stream_tuples: list[Any] | None = split(
             message["command"],
-            converter=[lambda t: split(t, sep=",", exact_split=2, discard_empty=False)],
+            default_converter=lambda t: split(
+                t, sep=",", exact_split=2, discard_empty=False
+            ),
         )
         if stream_tuples is None or None in stream_tuples:
             return Response.error(message)
@@ -37,6 +37,12 @@ class ExecPrompt(PluginThread):
     zulip_events = ["reaction"]
 
     _approve_emoji: Final[str] = "check"
+    _message_id_pattern: Final[re.Pattern[str]] = re.compile(
+        r"^original_message_id: (\d+)$", re.MULTILINE
+    )
+    _command_pattern: Final[re.Pattern[str]] = re.compile(
+        r"^command: (.*)", re.DOTALL | re.MULTILINE
+    )
 
     def handle_zulip_event(self, event: Event) -> Response | Iterable[Response]:
         result: dict[str, Any]
@@ -54,11 +60,11 @@ class ExecPrompt(PluginThread):
 
         # The original message id, so the id of the message that triggered the
         # request message.
-        message_id_m: re.Match[str] | None = re.search(
-            r"^original_message_id: (\d+)$", request_msg["content"], re.MULTILINE
+        message_id_m: re.Match[str] | None = self._message_id_pattern.search(
+            request_msg["content"]
         )
-        command_m: re.Match[str] | None = re.search(
-            r"^command: (.*)", request_msg["content"], re.DOTALL | re.MULTILINE
+        command_m: re.Match[str] | None = self._command_pattern.search(
+            request_msg["content"]
         )
         if message_id_m is None or command_m is None:
             self.logger.error("could not parse %s", request_msg["content"])
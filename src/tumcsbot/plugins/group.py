@@ -115,6 +115,9 @@ class Group(PluginCommandMixin, PluginProcess):
     )
     _announcement_msg_table_row_fmt: str = "%s | :%s:"
     _announcement_msg_table_row_regex: str = r"\n*%s \| :[^:]+:\s*\n*"
+    _announcement_msg_continued_pattern: re.Pattern[str] = re.compile(
+        r"\n*\*to be continued\*\n*"
+    )
     _claim_all_sql: str = "insert into GroupClaimsAll values (?)"
     _claim_group_sql: str = "insert into GroupClaims values (?,?)"
     _get_all_emojis_sql: str = "select Emoji from Groups"
@@ -129,10 +132,10 @@ class Group(PluginCommandMixin, PluginProcess):
     )
     _insert_sql: str = "insert into Groups values (?,?,?)"
     _is_group_claimed_by_msg_sql: str = (
-        "select * from GroupClaims where GroupId = ? and MessageId = ?"
+        "select 1 from GroupClaims where GroupId = ? and MessageId = ? limit 1"
     )
     _is_message_announcement_sql: str = (
-        "select * from GroupClaimsAll where MessageId = ?"
+        "select 1 from GroupClaimsAll where MessageId = ? limit 1"
     )
     _list_sql: str = "select * from Groups"
     _remove_sql: str = "delete from Groups where Id = ? collate nocase"
@@ -204,7 +207,6 @@ class Group(PluginCommandMixin, PluginProcess):
         self.command_parser.add_subcommand("fix_all")
 
         # Init some usefule constants.
-        self._get_emoji: re.Pattern[str] = re.compile(r"\s*:?([^:]+):?\s*")
         self.client_id: int = self.client.id
         # (removing trailing 'api/' from host url).
         self.message_link: str = (
@@ -381,12 +383,10 @@ class Group(PluginCommandMixin, PluginProcess):
             return False
         to_insert: str = self._announcement_msg_table_row_fmt % (group_id, emoji)
 
-        pattern: re.Pattern[str] = re.compile(r"\n*\*to be continued\*\n*")
-
         return self._do_for_all_announcement_messages(
             [
                 lambda msg: msg.update(
-                    content=pattern.sub(
+                    content=self._announcement_msg_continued_pattern.sub(
                         "\n" + to_insert + "\n*to be continued*\n\n", msg["content"]
                     )
                 ),
@@ -4,6 +4,7 @@
 # TUM CS Bot - https://github.com/ro-i/tumcsbot
 
 from inspect import cleandoc
+from operator import itemgetter
 from typing import Any, Iterable
 
 from tumcsbot.lib import DB, Response, get_classes_from_path
@@ -45,7 +46,7 @@ class Help(PluginCommandMixin, PluginThread):
     )
 
     def _init_plugin(self) -> None:
-        self.help_info: list[tuple[str, str, str]] = self._get_help_info()
+        self._update_help_info()
 
     def handle_message(self, message: dict[str, Any]) -> Response | Iterable[Response]:
         command: str = message["command"].strip()
@@ -57,8 +58,7 @@ class Help(PluginCommandMixin, PluginThread):
     def _format_description(description: str) -> str:
         """Format the usage description of a command."""
         # Remove surrounding whitespace.
-        description.strip()
-        return description
+        return description.strip()
 
     @staticmethod
     def _format_syntax(syntax: str) -> str:
@@ -70,7 +70,7 @@ class Help(PluginCommandMixin, PluginThread):
 
         Return a list of tuples (command name, syntax, description).
         """
-        db: DB = DB()
+        db: DB = DB(read_only=True)
         result_sql: list[tuple[Any, ...]] = db.execute(self._get_usage_all_sql)
         db.close()
         result: list[tuple[str, str, str]] = [
@@ -79,13 +79,27 @@ class Help(PluginCommandMixin, PluginThread):
             if syntax is not None and description is not None
         ]
         # Sort by name.
-        return sorted(result, key=lambda tuple: tuple[0])
+        result.sort(key=itemgetter(0))
+        return result
+
+    def _update_help_info(self) -> None:
+        """(Re)load the help information from the database.
+
+        Also fill the list of commands into the help overview, which
+        only changes together with the help information. Only the name
+        of the user remains to be inserted.
+        """
+        self.help_info: list[tuple[str, str, str]] = self._get_help_info()
+        commands: str = "\n".join("- " + name for name, _, _ in self.help_info)
+        prefix, infix, suffix = self._help_overview_template.split("{}")
+        self._help_overview_prefix: str = prefix
+        self._help_overview_suffix: str = infix + commands + suffix
 
     def _help_command(
         self, message: dict[str, Any], command: str
     ) -> Response | Iterable[Response]:
         info_tuple: tuple[str, str, str] | None = None
-        self.help_info = self._get_help_info()
+        self._update_help_info()
 
         for ituple in self.help_info:
             if ituple[0] == command:
@@ -101,16 +115,11 @@ class Help(PluginCommandMixin, PluginThread):
         )
 
     def _help_overview(self, message: dict[str, Any]) -> Response | Iterable[Response]:
-        # Get the command names.
-        help_message: str = "\n".join(
-            map(lambda tuple: "- " + tuple[0], self.help_info)
-        )
-
         return Response.build_message(
             message,
-            self._help_overview_template.format(
-                message["sender_full_name"], help_message
-            ),
+            self._help_overview_prefix
+            + message["sender_full_name"]
+            + self._help_overview_suffix,
             msg_type="private",
             to=message["sender_email"],
         )
@@ -191,6 +191,9 @@ class Moderate(PluginCommandMixin, PluginThread):
         "insert or ignore into ReactionConfig values (?, ?, ?, ?, ?)"
     )
     _delete_reaction_sql: str = "delete from ReactionConfig where "
+    _delete_user_reaction_sql: str = (
+        "delete from ReactionConfig where Emote = ? and UserId = ?"
+    )
 
     _list_authorized_streams_sql: str = "select a.StreamId from GroupAuthorization a, UserGroupMembers m where a.GroupId = m.GroupId and m.UserId = ?"
     _list_authorization_sql: str = "select * from GroupAuthorization"
@@ -546,25 +549,22 @@ class Moderate(PluginCommandMixin, PluginThread):
                 )
                 continue
 
-            for emote_str, action_str, msg_str, desc in self._default_config:
-                db_cmd = (
-                    self._delete_reaction_sql
-                    + f" Emote = '{emote_str}' and UserId = {user_id}"
-                )
-                self._db.execute(db_cmd, commit=True)
-
-            reactions: set[str] = set()
-            for emote_str, action_str, msg_str, desc in self._default_config:
-                self._db.execute(
-                    self._insert_reaction_sql,
-                    user_id,
-                    emote_str,
-                    action_str,
-                    msg_str,
-                    desc,
-                    commit=True,
-                )
-                reactions.add(emote_str)
+            # Replace the configuration in a single transaction.
+            self._db.execute_many(
+                self._delete_user_reaction_sql,
+                ((emote_str, user_id) for emote_str, _, _, _ in self._default_config),
+            )
+            self._db.execute_many(
+                self._insert_reaction_sql,
+                (
+                    (user_id, emote_str, action_str, msg_str, desc)
+                    for emote_str, action_str, msg_str, desc in self._default_config
+                ),
+                commit=True,
+            )
+            reactions: set[str] = {
+                emote_str for emote_str, _, _, _ in self._default_config
+            }
 
             reaction_str = " \n".join(
                 [
@@ -59,9 +59,10 @@ class Msg(PluginCommandMixin, PluginThread):
         command, _, args = result
 
         if command == "list":
-            response: str = "***List of Identifiers and Messages***\n"
-            for ident, text in self._db.execute(self._list_sql):
-                response += f"\n--------\nTitle: **{ident}**\n{text}"
+            response: str = "***List of Identifiers and Messages***\n" + "".join(
+                f"\n--------\nTitle: **{ident}**\n{text}"
+                for ident, text in self._db.execute(self._list_sql)
+            )
             return Response.build_message(message, response)
 
         # Use lowercase -> no need for case insensitivity.
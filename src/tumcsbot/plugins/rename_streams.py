@@ -28,7 +28,8 @@ class RenameStreams(PluginCommandMixin, PluginThread):
         failed: list[str] = []
 
         stream_tuples: list[Any] | None = split(
-            message["command"], converter=[lambda t: split(t, sep=",", exact_split=2)]
+            message["command"],
+            default_converter=lambda t: split(t, sep=",", exact_split=2),
         )
         if stream_tuples is None or None in stream_tuples:
             return Response.error(message)
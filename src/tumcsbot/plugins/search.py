@@ -16,15 +16,19 @@ class Search(PluginCommandMixin, PluginThread):
     msg_template: str = "Hi, I hope that these search results may help you: {}"
     path: str = "#narrow/streams/public/search/"
 
+    def _init_plugin(self) -> None:
+        super()._init_plugin()
+        # The search url without the search string
+        # (removing trailing 'api/' from host url).
+        self._search_url: str = self.client.base_url[:-4] + self.path
+
     def handle_message(self, message: dict[str, Any]) -> Response | Iterable[Response]:
         # Get search string and quote it.
         search: str = urllib.parse.quote(message["command"], safe="")
         # Fix strange behavior of Zulip which does not accept literal periods.
         search = search.replace(".", "%2E")
-        # Get host url (removing trailing 'api/').
-        base_url: str = self.client.base_url[:-4]
         # Build the full url.
-        url: str = base_url + self.path + search
+        url: str = self._search_url + search
         # Remove requesting message.
         self.client.delete_message(message["id"])
         return Response.build_message(message, self.msg_template.format(url))
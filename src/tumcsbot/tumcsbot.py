@@ -24,6 +24,7 @@ from tumcsbot.plugin import (
     Event,
     _Plugin,
     EventType,
+    PluginCommandMixin,
     PluginContext,
     PluginProcess,
     get_zulip_events_from_plugins,
@@ -76,19 +77,17 @@ class _RootClient(Client):
 
         # Fill in current data.
         stream_names: list[str] = self.get_public_stream_names(use_db=False)
-        for stream_name in stream_names:
-            subscribed: bool = False
-            # We do not compare the streams using lib.stream_names_equal here,
-            # because we store the stream names in the database as we receive
-            # them from Zulip. There is no user interaction involved.
-            if stream_name in old_streams and old_streams[stream_name] == 1:
-                subscribed = True
-            self._db.execute(
-                "insert or ignore into PublicStreams values (?, ?)",
-                stream_name,
-                subscribed,
-                commit=True,
-            )
+        # We do not compare the streams using lib.stream_names_equal here,
+        # because we store the stream names in the database as we receive
+        # them from Zulip. There is no user interaction involved.
+        self._db.execute_many(
+            "insert or ignore into PublicStreams values (?, ?)",
+            (
+                (stream_name, old_streams.get(stream_name) == 1)
+                for stream_name in stream_names
+            ),
+            commit=True,
+        )
 
 
 class _ZulipEventListener(Thread):
@@ -142,6 +141,9 @@ class TumCSBot:
         self.events: list[str]
         self.plugins: dict[str, _Plugin] = {}
         self.plugins_stopped: dict[str, _Plugin] = {}
+        # Names of the command plugins which only care about messages
+        # carrying their own command name.
+        self.command_plugins: set[str] = set()
         self.restart: bool = False
         self.stopped: bool = False
 
@@ -211,12 +213,12 @@ class TumCSBot:
             # We need special handling for the start/stop events because
             # they operate on the thread/process workers.
             if event.dest in self.plugins:
-                if event.type == EventType.STOP:
+                if event.type is EventType.STOP:
                     self.stop_plugin(event.dest)
                 else:
                     self.plugins[event.dest].push_event(event)
             elif event.dest in self.plugins_stopped:
-                if event.type == EventType.START:
+                if event.type is EventType.START:
                     self.restart_plugin(event.dest)
                 else:
                     logging.warning(
@@ -224,6 +226,18 @@ class TumCSBot:
                     )
             else:
                 logging.error("event.dest unknown: %s", event.dest)
+        elif event.type is EventType.ZULIP:
+            # Do not bother command plugins with messages for other
+            # commands, they would reject them anyway.
+            command_name: str | None = None
+            if "message" in event.data:
+                command_name = event.data["message"].get("command_name")
+            for plugin_name, plugin in self.plugins.items():
+                if (
+                    plugin_name not in self.command_plugins
+                    or plugin_name == command_name
+                ):
+                    plugin.push_event(event)
         else:
             for plugin in self.plugins.values():
                 plugin.push_event(event)
@@ -254,15 +268,15 @@ class TumCSBot:
 
         while True:
             event: Event = self.event_queue.get()
-            logging.debug("received event %s", str(event))
+            logging.debug("received event %s", event)
 
-            if self.stopped or event.type == EventType._EMPTY:
-                if event.type == EventType._EMPTY and event.sender == "restart":
+            if self.stopped or event.type is EventType._EMPTY:
+                if event.type is EventType._EMPTY and event.sender == "restart":
                     self.restart = True
                 self.stopped = True
                 break
 
-            if event.type == EventType.ZULIP:
+            if event.type is EventType.ZULIP:
                 if event.data["type"] == "heartbeat":
                     continue
                 try:
@@ -292,7 +306,7 @@ class TumCSBot:
             for plugin_class in plugin_classes
         }
         for plugin_name in TopologicalSorter(plugin_graph).static_order():
-            logging.debug("start %s", plugin_name)
+            logging.debug("init %s", plugin_name)
             plugin_class = plugin_class_dict[plugin_name]
 
             push_loopback: Callable[[Event], None]
@@ -312,6 +326,23 @@ class TumCSBot:
             if plugin_name in self.plugins:
                 raise ValueError(f"plugin {plugin.plugin_name()} appears twice")
             self.plugins[plugin_name] = plugin
+            if (
+                issubclass(plugin_class, PluginCommandMixin)
+                and plugin_class.is_responsible is PluginCommandMixin.is_responsible
+            ):
+                self.command_plugins.add(plugin_name)
+
+        # Write the database entries of all plugins in one transaction.
+        db: lib.DB = lib.DB()
+        db.execute_many(
+            _Plugin._update_plugin_sql,
+            (plugin.get_db_entry() for plugin in self.plugins.values()),
+            commit=True,
+        )
+        db.close()
+
+        for plugin_name, plugin in self.plugins.items():
+            logging.debug("start %s", plugin_name)
             plugin.start()
 
     def stop_plugin(self, name: str, update_plugins_dicts: bool = True) -> None:
@@ -371,7 +402,7 @@ class TumCSBot:
             content = message["content"]
 
         cmd: list[str] = content.split(maxsplit=1)
-        logging.debug("received command line %s", str(cmd))
+        logging.debug("received command line %s", cmd)
 
         event["message"].update(
             command_name=cmd[0] if len(cmd) > 0 else "",